@@ -10,9 +10,7 @@ def long_word_count_graph(filename: str, parser: tp.Callable[[str], ops.TRow],
                           text_column: str = 'text', count_column: str = 'count') -> Graph:
     """Constructs graph which returns 10 most popular long words in text_column of all rows passed"""
     return Graph.graph_from_file(filename, parser) \
-        .map(ops.FilterPunctuation(text_column)) \
-        .map(ops.LowerCase(text_column)) \
-        .map(ops.Split(text_column)) \
+        .map(ops.TokenizeMapper(text_column)) \
         .sort([text_column]) \
         .reduce(ops.Count(count_column), [text_column]) \
         .sort([count_column, text_column]) \
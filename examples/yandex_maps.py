@@ -11,16 +11,14 @@ def big_yandex_maps_graph(filename_time: str, filename_length: str, parser: tp.C
     """Constructs graph which measures average speed in km/h depending on the weekday and hour"""
     dist_graph = Graph.graph_from_file(filename_length, parser) \
         .map(ops.HaversineMapper(start_coord_column, end_coord_column, 'distance')) \
-        .map(ops.Project([edge_id_column, 'distance'])) \
-        .sort([edge_id_column])
+        .map(ops.Project([edge_id_column, 'distance']))
 
     time_graph = Graph.graph_from_file(filename_time, parser) \
         .map(ops.TimeProcessMapper(enter_time_column, leave_time_column,
                                    'duration', hour_result_column, weekday_result_column)) \
-        .map(ops.Project([edge_id_column, 'duration', hour_result_column, weekday_result_column])) \
-        .sort(['edge_id'])
+        .map(ops.Project([edge_id_column, 'duration', hour_result_column, weekday_result_column]))
 
-    result_graph = time_graph.join(ops.InnerJoiner(), dist_graph, [edge_id_column]) \
+    result_graph = time_graph.join(ops.InnerJoiner(), dist_graph, [edge_id_column], strategy='hash') \
         .sort([weekday_result_column, hour_result_column]) \
         .reduce(ops.MultiSum(['duration', 'distance']), [weekday_result_column, hour_result_column]) \
         .map(ops.SpeedMapper('distance', 'duration', speed_result_column)) \
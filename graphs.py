@@ -4,9 +4,7 @@ from .lib import Graph, operations
 def word_count_graph(input_stream_name: str, text_column: str = 'text', count_column: str = 'count') -> Graph:
     """Constructs graph which counts words in text_column of all rows passed"""
     return Graph.graph_from_iter(input_stream_name) \
-        .map(operations.FilterPunctuation(text_column)) \
-        .map(operations.LowerCase(text_column)) \
-        .map(operations.Split(text_column)) \
+        .map(operations.TokenizeMapper(text_column)) \
         .sort([text_column]) \
         .reduce(operations.Count(count_column), [text_column]) \
         .sort([count_column, text_column])
@@ -16,9 +14,7 @@ def inverted_index_graph(input_stream_name: str, doc_column: str = 'doc_id', tex
                          result_column: str = 'tf_idf') -> Graph:
     """Constructs graph which calculates td-idf for every word/document pair"""
     graph1 = Graph.graph_from_iter(input_stream_name) \
-        .map(operations.FilterPunctuation(text_column)) \
-        .map(operations.LowerCase(text_column)) \
-        .map(operations.Split(text_column)) \
+        .map(operations.TokenizeMapper(text_column)) \
         .sort([doc_column, text_column])
 
     graph2 = Graph.graph_from_iter(input_stream_name)\
@@ -46,9 +42,7 @@ def pmi_graph(input_stream_name: str, doc_column: str = 'doc_id', text_column: s
               result_column: str = 'pmi') -> Graph:
     """Constructs graph which gives for every document the top 10 words ranked by pointwise mutual information"""
     graph1 = Graph.graph_from_iter(input_stream_name) \
-        .map(operations.FilterPunctuation(text_column)) \
-        .map(operations.LowerCase(text_column)) \
-        .map(operations.Split(text_column)).sort([doc_column, text_column]) \
+        .map(operations.TokenizeMapper(text_column)).sort([doc_column, text_column]) \
         .map(operations.Filter(operations.long_word))
 
     graph2 = graph1.reduce(operations.Count('count'), [doc_column, text_column]) \
@@ -77,16 +71,14 @@ def yandex_maps_graph(input_stream_name_time: str, input_stream_name_length: str
     """Constructs graph which measures average speed in km/h depending on the weekday and hour"""
     dist_graph = Graph.graph_from_iter(input_stream_name_length) \
         .map(operations.HaversineMapper(start_coord_column, end_coord_column, 'distance')) \
-        .map(operations.Project([edge_id_column, 'distance'])) \
-        .sort([edge_id_column])
+        .map(operations.Project([edge_id_column, 'distance']))
 
     time_graph = Graph.graph_from_iter(input_stream_name_time) \
         .map(operations.TimeProcessMapper(enter_time_column, leave_time_column,
                                           'duration', hour_result_column, weekday_result_column)) \
-        .map(operations.Project([edge_id_column, 'duration', hour_result_column, weekday_result_column])) \
-        .sort(['edge_id'])
+        .map(operations.Project([edge_id_column, 'duration', hour_result_column, weekday_result_column]))
 
-    result_graph = time_graph.join(operations.InnerJoiner(), dist_graph, [edge_id_column]) \
+    result_graph = time_graph.join(operations.InnerJoiner(), dist_graph, [edge_id_column], strategy='hash') \
         .sort([weekday_result_column, hour_result_column]) \
         .reduce(operations.MultiSum(['duration', 'distance']), [weekday_result_column, hour_result_column]) \
         .map(operations.SpeedMapper('distance', 'duration', speed_result_column)) \
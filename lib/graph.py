@@ -5,33 +5,98 @@ from . import external_sort as sort_
 
 
 import copy
+from itertools import islice
+import multiprocessing
+import os
+import queue as queue_
+import signal
+
+
+class ProcessGraph:
+    """Graph computed in a separate forked process, concurrently with the graph consuming its rows.
+    Rows are passed back through a bounded queue in batches. The process is not daemonic,
+    so the graph may itself contain parallel joins and reduces. The outermost process leads a process group
+    with all processes started inside of it, and the group is terminated as a whole once reading stops"""
+    batch_size = 1024
+    queue_size = 64
+    poll_interval = 1.0
+    _in_group = False
+
+    def __init__(self, graph: 'Graph') -> None:
+        self.graph = graph
+
+    def _feed(self, queue: tp.Any, kwargs: tp.Dict[str, tp.Any]) -> None:
+        if not ProcessGraph._in_group:
+            os.setpgid(0, 0)
+            ProcessGraph._in_group = True
+        try:
+            rows = iter(self.graph.gen_run(**kwargs))
+            batch = list(islice(rows, self.batch_size))
+            while batch:
+                queue.put(batch)
+                batch = list(islice(rows, self.batch_size))
+            queue.put(None)
+        except Exception as error:
+            queue.put(error)
+
+    def _read(self, kwargs: tp.Dict[str, tp.Any]) -> ops.TRowsGenerator:
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue(self.queue_size)
+        process = context.Process(target=self._feed, args=(queue, kwargs))
+        group = not ProcessGraph._in_group
+        process.start()
+        pid = tp.cast(int, process.pid)
+        if group:
+            # the process does the same, whichever of the two comes first
+            try:
+                os.setpgid(pid, pid)
+            except (PermissionError, ProcessLookupError):
+                pass
+        try:
+            while True:
+                try:
+                    batch = queue.get(timeout=self.poll_interval)
+                except queue_.Empty:
+                    if process.is_alive():
+                        continue
+                    # rows put right before exit may still be in flight
+                    try:
+                        batch = queue.get(timeout=self.poll_interval)
+                    except queue_.Empty:
+                        raise RuntimeError(f'Graph process exited with code {process.exitcode} '
+                                           f'before passing all rows') from None
+                if batch is None:
+                    return
+                if not isinstance(batch, list):
+                    raise batch
+                yield from batch
+        finally:
+            if group:
+                try:
+                    os.killpg(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            elif process.is_alive():
+                process.terminate()
+            process.join()
 
-
-class Queue:
-    def __init__(self, sequence: tp.List[tp.Any]) -> None:
-        self.back_sequence: tp.List[tp.Any] = []
-        self.front_sequence: tp.List[tp.Any] = list(sequence[::-1])
-
-    def push(self, element: tp.Any) -> None:
-        self.back_sequence.append(element)
-
-    def pop(self) -> tp.Any:
-        if len(self.front_sequence) == 0:
-            self.front_sequence = list(self.back_sequence[::-1])
-            self.back_sequence = []
-        return self.front_sequence.pop()
-
-    def size(self) -> int:
-        return len(self.back_sequence) + len(self.front_sequence)
+    def gen_run(self, **kwargs: tp.Any) -> ops.TRowsGenerator:
+        """Return generator over rows of graph which is computed in the background once iteration starts.
+        Data sources are inherited by forking, so they need not be picklable; rows must be.
+        Falls back to running in this process where fork is not available
+        """
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            return self.graph.gen_run(**kwargs)
+        return self._read(kwargs)
 
 
 class Graph:
     """Computational graph implementation"""
 
     def __init__(self) -> None:
-        self.queue = Queue([])
+        self.stages: tp.Tuple[tp.Tuple[tp.Any, ...], ...] = ()
         self.kwarg_name: str
-        self.parser: tp.Callable[[str], ops.TRow]
+        self.parser: tp.Optional[tp.Callable[[str], ops.TRow]] = None
 
     @staticmethod
     def graph_from_iter(name: str) -> 'Graph':
@@ -45,8 +110,9 @@ class Graph:
 
     @staticmethod
     def read_file(filename: str, parser: tp.Callable[[str], ops.TRow]) -> ops.TRowsGenerator:
-        for line in open(filename):
-            yield parser(line)
+        with open(filename, buffering=1 << 20) as file:
+            for line in file:
+                yield parser(line)
 
     @staticmethod
     def graph_from_file(filename: str, parser: tp.Callable[[str], ops.TRow]) -> 'Graph':
@@ -59,54 +125,66 @@ class Graph:
         graph.kwarg_name = filename
         return graph
 
+    def _extend(self, *stage: tp.Any) -> 'Graph':
+        """Construct new graph with the same data source and one more stage appended
+        :param stage: operation followed by graphs it takes as additional inputs
+        """
+        graph = copy.copy(self)
+        graph.stages = self.stages + (stage,)
+        return graph
+
     def map(self, mapper: ops.Mapper) -> 'Graph':
         """Construct new graph extended with map operation with particular mapper
         :param mapper: mapper to use
         """
-        graph = copy.deepcopy(self)
-        graph.queue.push([ops.Map(mapper)])
-        return graph
+        return self._extend(ops.Map(mapper))
 
-    def reduce(self, reducer: ops.Reducer, keys: tp.Sequence[str]) -> 'Graph':
+    def reduce(self, reducer: ops.Reducer, keys: tp.Sequence[str], workers: tp.Optional[int] = None) -> 'Graph':
         """Construct new graph extended with reduce operation with particular reducer
         :param reducer: reducer to use
         :param keys: keys for grouping
+        :param workers: number of processes to reduce groups in (reducer and rows must be picklable),
+         worth it for heavy reducers only
         """
-        graph = copy.deepcopy(self)
-        graph.queue.push([ops.Reduce(reducer, keys)])
-        return graph
+        return self._extend(ops.Reduce(reducer, keys, workers))
 
     def sort(self, keys: tp.Sequence[str]) -> 'Graph':
         """Construct new graph extended with sort operation
         :param keys: sorting keys (typical is tuple of strings)
         """
-        graph = copy.deepcopy(self)
-        graph.queue.push([sort_.ExternalSort(keys)])
-        return graph
+        return self._extend(sort_.ExternalSort(keys))
 
-    def join(self, joiner: ops.Joiner, join_graph: 'Graph', keys: tp.Sequence[str]) -> 'Graph':
+    def merge(self, merge_graphs: tp.Sequence['Graph'], keys: tp.Sequence[str]) -> 'Graph':
+        """Construct new graph extended with merge of rows with rows of other graphs, all of them sorted by keys.
+        Result is sorted by keys too, so it may be reduced or joined without sort
+        :param merge_graphs: other graphs to merge with
+        :param keys: sorting keys
+        """
+        return self._extend(ops.MergeSorted(keys), *merge_graphs)
+
+    def join(self, joiner: ops.Joiner, join_graph: 'Graph', keys: tp.Sequence[str],
+             parallel: bool = False, strategy: str = 'merge') -> 'Graph':
         """Construct new graph extended with join operation with another graph
         :param joiner: join strategy to use
         :param join_graph: other graph to join with
         :param keys: keys for grouping
+        :param parallel: compute join_graph in a separate process (worth it for heavy independent branches only)
+        :param strategy: 'merge' (default) needs both graphs sorted by keys; 'hash' keeps join_graph in memory
+         and needs no sorting, so it suits small join_graph, but values of keys must be hashable
         """
-        graph = copy.deepcopy(self)
-        graph.queue.push([ops.Join(joiner, keys), join_graph])
-        return graph
+        join_op = ops.Join(joiner, keys, strategy)
+        return self._extend(join_op, ProcessGraph(join_graph) if parallel else join_graph)
 
     def gen_run(self, **kwargs: tp.Any) -> ops.TRowsGenerator:
-        graph = copy.deepcopy(self)
-        if graph.kwarg_name[-4:] == '.txt':
-            object_ = Graph.read_file(graph.kwarg_name, self.parser)
+        """Lazy version of 'run'. Stages and their operations are shared, not copied, between runs
+        and derived graphs, so operations must not keep per-run state outside of the generators they return
+        """
+        if self.parser is not None:
+            object_ = Graph.read_file(self.kwarg_name, self.parser)
         else:
-            object_ = kwargs[graph.kwarg_name]()
-        while graph.queue.size() > 0:
-            op = graph.queue.pop()
-            if len(op) == 1:
-                object_ = op[0](object_)
-            else:
-                another_object = op[1].gen_run(**kwargs)
-                object_ = op[0](object_, another_object)
+            object_ = kwargs[self.kwarg_name]()
+        for op, *join_graphs in self.stages:
+            object_ = op(object_, *[join_graph.gen_run(**kwargs) for join_graph in join_graphs])
         return object_
 
     def run(self, **kwargs: tp.Any) -> tp.List[ops.TRow]:
@@ -2,9 +2,12 @@ from abc import abstractmethod, ABC
 import typing as tp
 
 import heapq
-from itertools import groupby
+from collections import Counter, deque
+from itertools import chain, groupby, islice
+from operator import itemgetter
+import multiprocessing
 import numpy as np
-from math import radians, cos, sin, asin, sqrt
+from math import radians, cos, sin, asin, sqrt, log
 import datetime
 
 TRow = tp.Dict[str, tp.Any]
@@ -12,6 +15,14 @@ TRowsIterable = tp.Iterable[TRow]
 TRowsGenerator = tp.Generator[TRow, None, None]
 
 
+def _key_getter(keys: tp.Sequence[str]) -> tp.Callable[[TRow], tp.Any]:
+    """Build function extracting values of keys from row in comparable form:
+    the value itself for single key (no tuple is built per row), tuple of values otherwise"""
+    if len(keys) == 0:
+        return lambda row: ()
+    return itemgetter(*keys)
+
+
 class Operation(ABC):
     @abstractmethod
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
@@ -31,13 +42,35 @@ class Mapper(ABC):
         pass
 
 
+class BatchMapper(Mapper):
+    """Base class for mappers which can also process consecutive rows in batches"""
+    batch_size = 16384
+
+    @abstractmethod
+    def process_batch(self, rows: tp.List[TRow]) -> TRowsGenerator:
+        """
+        :param rows: at most batch_size consecutive table rows
+        """
+        pass
+
+
 class Map(Operation):
     def __init__(self, mapper: Mapper) -> None:
         self.mapper = mapper
 
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
-        for row in rows:
-            yield from self.mapper(row)
+        mapper = self.mapper
+        if type(mapper) is DummyMapper:
+            yield from rows
+        elif isinstance(mapper, BatchMapper):
+            rows_iter = iter(rows)
+            batch = list(islice(rows_iter, mapper.batch_size))
+            while batch:
+                yield from mapper.process_batch(batch)
+                batch = list(islice(rows_iter, mapper.batch_size))
+        else:
+            for row in rows:
+                yield from mapper(row)
 
 
 class Reducer(ABC):
@@ -45,29 +78,64 @@ class Reducer(ABC):
     @abstractmethod
     def __call__(self, group_key: tp.Sequence[str], rows: TRowsIterable) -> TRowsGenerator:
         """
-        :param rows: table rows
+        :param rows: table rows of one group
         """
         pass
 
 
+def _reduce_groups(reducer: Reducer, keys: tp.Sequence[str], groups: tp.List[tp.List[TRow]]) -> tp.List[TRow]:
+    return [row for group in groups for row in reducer(keys, group)]
+
+
 class Reduce(Operation):
-    def __init__(self, reducer: Reducer, keys: tp.Sequence[str]) -> None:
+    def __init__(self, reducer: Reducer, keys: tp.Sequence[str],
+                 workers: tp.Optional[int] = None, chunksize: int = 64) -> None:
+        """
+        :param workers: number of processes to reduce groups in, groups are reduced in this process if None
+        :param chunksize: number of groups sent to worker process at once,
+         at most two chunks per worker are read ahead of the output
+        """
         self.reducer = reducer
         self.keys = keys
+        self._get_key = _key_getter(keys)
+        self.workers = workers
+        self.chunksize = chunksize
 
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
-        previous_key: tp.Any = None
-        group_block: tp.List[tp.Any] = []
-        for row in rows:
-            current_key = {k: row[k] for k in self.keys}
-            if previous_key is None or current_key == previous_key:
-                group_block.append(row)
+        keys = self.keys
+        reducer = self.reducer
+        if type(reducer) is FirstReducer:
+            # first row of every group is the whole result, no need to collect groups
+            if len(keys) == 0:
+                yield from islice(rows, 1)
             else:
-                yield from self.reducer(self.keys, group_block)
-                group_block = [row]
-            previous_key = current_key
-        if len(group_block) > 0:
-            yield from self.reducer(self.keys, group_block)
+                for _, group in groupby(rows, self._get_key):
+                    yield next(group)
+            return
+        if len(keys) == 0:
+            rows_list = list(rows)
+            if len(rows_list) > 0:
+                yield from reducer(keys, rows_list)
+            return
+        if self.workers is None:
+            if type(reducer) in _SINGLE_PASS_REDUCERS:
+                # these read group once, so it is streamed to them without collecting into list
+                for _, group in groupby(rows, self._get_key):
+                    yield from reducer(keys, group)
+            else:
+                for _, group in groupby(rows, self._get_key):
+                    yield from reducer(keys, list(group))
+        else:
+            groups = (list(group) for _, group in groupby(rows, self._get_key))
+            chunks = iter(lambda: list(islice(groups, self.chunksize)), [])
+            pending: tp.Deque[tp.Any] = deque()
+            with multiprocessing.Pool(self.workers) as pool:
+                for chunk in chunks:
+                    pending.append(pool.apply_async(_reduce_groups, (reducer, keys, chunk)))
+                    if len(pending) >= 2 * self.workers:
+                        yield from pending.popleft().get()
+                while pending:
+                    yield from pending.popleft().get()
 
 
 class Joiner(ABC):
@@ -87,37 +155,102 @@ class Joiner(ABC):
 
 
 class Join(Operation):
-    def __init__(self, joiner: Joiner, keys: tp.Sequence[str]):
+    def __init__(self, joiner: Joiner, keys: tp.Sequence[str], strategy: str = 'merge'):
+        """
+        :param strategy: 'merge' to join inputs sorted by keys,
+         'hash' to load the second input into memory and join inputs in any order (values of keys must be hashable)
+        """
+        if strategy not in ('merge', 'hash'):
+            raise ValueError(f'Unknown join strategy: {strategy}')
         self.keys = keys
+        self._get_key = _key_getter(keys)
         self.joiner = joiner
+        self.strategy = strategy
 
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
-        empty_tuple: tp.Tuple[tp.Any, ...] = tuple()
-        empty_iter: tp.Iterator[tp.Any] = iter([])
-        empty_gen: tp.Tuple[tp.Any, tp.Iterator[tp.Any]] = (empty_tuple, empty_iter)
-
-        gen_a = groupby(rows, lambda x: [x[k] for k in self.keys])
-        gen_b = groupby(args[0], lambda x: [x[k] for k in self.keys])
-        key_a, group_a = next(gen_a, empty_gen)
-        key_b, group_b = next(gen_b, empty_gen)
-
-        while group_a != empty_iter and group_b != empty_iter:
-            if key_a < key_b:
-                yield from self.joiner(self.keys, group_a, empty_iter)
-                key_a, group_a = next(gen_a, empty_gen)
-            elif key_a == key_b:
-                yield from self.joiner(self.keys, group_a, group_b)
-                key_a, group_a = next(gen_a, empty_gen)
-                key_b, group_b = next(gen_b, empty_gen)
+        if self.strategy == 'hash':
+            return self._hash_join(rows, args[0])
+        return self._merge_join(rows, args[0])
+
+    def _hash_join(self, rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
+        keys = self.keys
+        joiner = self.joiner
+        get_key = self._get_key
+        table: tp.Dict[tp.Any, tp.List[TRow]] = {}
+        for row in rows_b:
+            key = get_key(row)
+            try:
+                group = table.get(key)
+            except TypeError as error:
+                raise TypeError(f'Hash join needs hashable values of keys {list(keys)}: {error}') from error
+            if group is None:
+                table[key] = [row]
             else:
-                yield from self.joiner(self.keys, empty_iter, group_b)
-                key_b, group_b = next(gen_b, empty_gen)
-        while group_a != empty_iter:
-            yield from self.joiner(self.keys, group_a, empty_iter)
-            key_a, group_a = next(gen_a, empty_gen)
-        while group_b != empty_iter:
-            yield from self.joiner(self.keys, empty_iter, group_b)
-            key_b, group_b = next(gen_b, empty_gen)
+                group.append(row)
+
+        matched = set()
+        for key, group_a in groupby(rows_a, get_key):
+            try:
+                group_b = table.get(key, ())
+            except TypeError as error:
+                raise TypeError(f'Hash join needs hashable values of keys {list(keys)}: {error}') from error
+            if group_b:
+                matched.add(key)
+            yield from joiner(keys, group_a, group_b)
+        for key, group_b in table.items():
+            if key not in matched:
+                yield from joiner(keys, (), group_b)
+
+    def _merge_join(self, rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
+        no_rows: TRowsIterable = ()
+
+        keys = self.keys
+        joiner = self.joiner
+        get_key = self._get_key
+        next_a = groupby(rows_a, get_key).__next__
+        next_b = groupby(rows_b, get_key).__next__
+        key_a: tp.Any = None
+        key_b: tp.Any = None
+        group_a: tp.Any = None
+        group_b: tp.Any = None
+        try:
+            key_a, group_a = next_a()
+        except StopIteration:
+            pass
+        try:
+            key_b, group_b = next_b()
+        except StopIteration:
+            pass
+
+        while group_a is not None or group_b is not None:
+            # order of current groups: negative if only group_a is joined, positive if only group_b, zero if both
+            if group_b is None:
+                order = -1
+            elif group_a is None:
+                order = 1
+            else:
+                order = (key_a > key_b) - (key_a < key_b)
+            yield from joiner(keys, group_a if order <= 0 else no_rows, group_b if order >= 0 else no_rows)
+            if order <= 0:
+                try:
+                    key_a, group_a = next_a()
+                except StopIteration:
+                    group_a = None
+            if order >= 0:
+                try:
+                    key_b, group_b = next_b()
+                except StopIteration:
+                    group_b = None
+
+
+class MergeSorted(Operation):
+    """Merge tables sorted by keys into one table sorted by keys"""
+    def __init__(self, keys: tp.Sequence[str]) -> None:
+        self.keys = keys
+        self._get_key = _key_getter(keys)
+
+    def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
+        yield from heapq.merge(rows, *args, key=self._get_key)
 
 
 # Dummy operators
@@ -132,16 +265,28 @@ class DummyMapper(Mapper):
 class FirstReducer(Reducer):
     """Yield only first row from passed ones"""
     def __call__(self, group_key: tp.Sequence[tp.Any], rows: TRowsIterable) -> TRowsGenerator:
-        for row in rows:
-            yield row
-            break
+        first = next(iter(rows), None)
+        if first is not None:
+            yield first
 
 
 # Mappers
 
 
+class _PunctuationTable(tp.Dict[int, tp.Optional[int]]):
+    """Translation table for str.translate which keeps letters and spaces only,
+    filled lazily with the code points met in the text"""
+    def __missing__(self, code: int) -> tp.Optional[int]:
+        symbol = chr(code)
+        value = code if symbol.isalpha() or symbol == " " else None
+        self[code] = value
+        return value
+
+
 class FilterPunctuation(Mapper):
     """Left only non-punctuation symbols"""
+    _table = _PunctuationTable()
+
     def __init__(self, column: str):
         """
         :param column: name of column to process
@@ -149,8 +294,8 @@ class FilterPunctuation(Mapper):
         self.column = column
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        yield {key: ''.join([symbol for word in value for symbol in word if symbol.isalpha() or symbol == " "])
-               if key == self.column else value for key, value in row.items()}
+        row[self.column] = row[self.column].translate(self._table)
+        yield row
 
 
 class LowerCase(Mapper):
@@ -161,12 +306,9 @@ class LowerCase(Mapper):
         """
         self.column = column
 
-    @staticmethod
-    def _lower_case(txt: str) -> str:
-        return txt.lower()
-
     def __call__(self, row: TRow) -> TRowsGenerator:
-        yield {key: self._lower_case(value) if key == self.column else value for key, value in row.items()}
+        row[self.column] = row[self.column].lower()
+        yield row
 
 
 class Split(Mapper):
@@ -180,9 +322,25 @@ class Split(Mapper):
         self.separator = separator
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        values_in_row = [v.split() for k, v in row.items() if k == self.column][0]
-        for val in values_in_row:
-            yield {key: val if key == self.column else value for key, value in row.items()}
+        for val in row[self.column].split(self.separator):
+            yield {**row, self.column: val}
+
+
+class TokenizeMapper(Mapper):
+    """Split row on multiple rows by words of column in lower case without punctuation,
+    same as FilterPunctuation, LowerCase and Split applied in one pass"""
+    _table = FilterPunctuation._table
+
+    def __init__(self, column: str) -> None:
+        """
+        :param column: name of column to tokenize
+        """
+        self.column = column
+
+    def __call__(self, row: TRow) -> TRowsGenerator:
+        column = self.column
+        for word in row[column].translate(self._table).lower().split():
+            yield {**row, column: word}
 
 
 class Product(Mapper):
@@ -227,7 +385,7 @@ class Project(Mapper):
         self.columns = columns
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        yield {key: value for key, value in row.items() if key in self.columns}
+        yield {key: row[key] for key in self.columns if key in row}
 
 
 class TfIdfMapper(Mapper):
@@ -242,7 +400,7 @@ class TfIdfMapper(Mapper):
         self.result = result
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        row[self.result] = row[self.frequency] * np.log(row[self.total_doc_count] / row[self.word_doc_count])
+        row[self.result] = row[self.frequency] * log(row[self.total_doc_count] / row[self.word_doc_count])
         yield row
 
 
@@ -254,7 +412,7 @@ class PMIMapper(Mapper):
         self.result = result
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        row[self.result] = np.log(row[self.doc_freq] / row[self.total_freq])
+        row[self.result] = log(row[self.doc_freq] / row[self.total_freq])
         yield row
 
 
@@ -284,7 +442,18 @@ def haversine(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
     return c * r
 
 
-class HaversineMapper(Mapper):
+def haversine_array(lon1: np.ndarray, lat1: np.ndarray, lon2: np.ndarray, lat2: np.ndarray) -> np.ndarray:
+    """Vectorized version of haversine for arrays of points"""
+    lon1, lat1, lon2, lat2 = map(np.radians, [lon1, lat1, lon2, lat2])
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+    c = 2 * np.arcsin(np.sqrt(a))
+    r = 6373
+    return c * r
+
+
+class HaversineMapper(BatchMapper):
     """Counts haversine distance in kilometers between two points using their coordinates"""
 
     def __init__(self, start_point: str, end_point: str, result_length: str):
@@ -297,8 +466,21 @@ class HaversineMapper(Mapper):
                                             row[self.end_point][0], row[self.end_point][1])
         yield row
 
+    def process_batch(self, rows: tp.List[TRow]) -> TRowsGenerator:
+        start = np.array([(row[self.start_point][0], row[self.start_point][1]) for row in rows], dtype=np.float64)
+        end = np.array([(row[self.end_point][0], row[self.end_point][1]) for row in rows], dtype=np.float64)
+        lengths = haversine_array(start[:, 0], start[:, 1], end[:, 0], end[:, 1])
+        for row, length in zip(rows, lengths.tolist()):
+            row[self.result_length] = length
+            yield row
+
+
+def parse_times(times: tp.Sequence[str]) -> np.ndarray:
+    """Parse times in '%Y%m%dT%H%M%S[.%f]' format into array of datetime64[us]"""
+    return np.array([f'{t[:4]}-{t[4:6]}-{t[6:11]}:{t[11:13]}:{t[13:]}' for t in times], dtype='datetime64[us]')
 
-class TimeProcessMapper(Mapper):
+
+class TimeProcessMapper(BatchMapper):
     """Counts duration of trip in hours, its weekday and daytime"""
 
     def __init__(self, enter_time: str, leave_time: str, duration: str,
@@ -325,6 +507,20 @@ class TimeProcessMapper(Mapper):
         row[self.duration] = timedelta.days * 24 + (timedelta.seconds + timedelta.microseconds / 1000000) / 3600
         yield row
 
+    def process_batch(self, rows: tp.List[TRow]) -> TRowsGenerator:
+        weekday_array: tp.List[str] = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+        entry = parse_times([row[self.enter_time] for row in rows])
+        quit = parse_times([row[self.leave_time] for row in rows])
+        # 1970-01-01 is Thursday
+        weekdays = ((entry.astype('datetime64[D]').astype(np.int64) + 3) % 7).tolist()
+        hours = (entry.astype('datetime64[h]').astype(np.int64) % 24).tolist()
+        durations = ((quit - entry).astype(np.int64) / 3600000000).tolist()
+        for row, weekday, hour, duration in zip(rows, weekdays, hours, durations):
+            row[self.weekday] = weekday_array[weekday]
+            row[self.daytime] = hour
+            row[self.duration] = duration
+            yield row
+
 
 class SpeedMapper(Mapper):
     """Counts speed using distance and duration"""
@@ -353,19 +549,7 @@ class TopN(Reducer):
         self.n = n
 
     def __call__(self, group_key: tp.Sequence[str], rows: TRowsIterable) -> TRowsGenerator:
-        """to construct heap with rows sorted by row[self.column_max] with maximum value
-         in the top we have to push 3-tuple:
-         -row[self.column_max] as a value we compare rows by,
-         np.random.uniform() as a value which is unique for each element of heap
-         to prevent comparing dicts with < or >,
-         row to use
-         """
-        heap: tp.Any = []
-        for row in rows:
-            heap.append((-row[self.column_max], np.random.uniform(), row))
-        heapq.heapify(heap)
-        for i in range(min(self.n, len(heap))):
-            yield heapq.heappop(heap)[2]
+        yield from heapq.nlargest(self.n, rows, key=itemgetter(self.column_max))
 
 
 class TermFrequency(Reducer):
@@ -379,17 +563,17 @@ class TermFrequency(Reducer):
         self.result_column = result_column
 
     def __call__(self, group_key: tp.Sequence[str], rows: TRowsIterable) -> TRowsGenerator:
-        number_in_group = 0
-        dict_: tp.Dict[str, tp.Any] = {}
-        for row in rows:
-            if row[self.words_column] not in dict_:
-                dict_[row[self.words_column]] = 1
-            else:
-                dict_[row[self.words_column]] += 1
-            number_in_group += 1
-        for k, v in dict_.items():
-            answer_dict = {key: row[key] for key in group_key}
-            answer_dict[self.words_column] = k
+        rows_iter = iter(rows)
+        first = next(rows_iter, None)
+        if first is None:
+            return
+        words_column = self.words_column
+        counter = Counter(row[words_column] for row in chain([first], rows_iter))
+        number_in_group = sum(counter.values())
+        group_dict = {key: first[key] for key in group_key}
+        for k, v in counter.items():
+            answer_dict = group_dict.copy()
+            answer_dict[words_column] = k
             answer_dict[self.result_column] = v / number_in_group
             yield answer_dict
 
@@ -403,10 +587,14 @@ class Count(Reducer):
         self.column = column
 
     def __call__(self, group_key: tp.Sequence[str], rows: TRowsIterable) -> TRowsGenerator:
-        counter = 0
-        for row in rows:
+        rows_iter = iter(rows)
+        first = next(rows_iter, None)
+        if first is None:
+            return
+        counter = 1
+        for _ in rows_iter:
             counter += 1
-        dict_ = {key: row[key] for key in row if key in group_key}
+        dict_ = {key: first[key] for key in group_key}
         dict_[self.column] = counter
         yield dict_
 
@@ -420,11 +608,11 @@ class Sum(Reducer):
         self.column = column
 
     def __call__(self, group_key: tp.Sequence[str], rows: TRowsIterable) -> TRowsGenerator:
-        sum_score = 0
-        for row in rows:
-            sum_score += row[self.column]
-        dict_ = {key: row[key] for key in row if key in group_key}
-        dict_[self.column] = sum_score
+        rows_list = list(rows)
+        if len(rows_list) == 0:
+            return
+        dict_ = {key: rows_list[0][key] for key in group_key}
+        dict_[self.column] = sum(map(itemgetter(self.column), rows_list))
         yield dict_
 
 
@@ -437,37 +625,78 @@ class MultiSum(Reducer):
         self.columns = columns
 
     def __call__(self, group_key: tp.Sequence[str], rows: TRowsIterable) -> TRowsGenerator:
-        sum_score = {key: 0 for key in self.columns}
-        for row in rows:
-            for key in self.columns:
-                sum_score[key] += row[key]
-        dict_ = {key: row[key] for key in row if key in group_key}
+        rows_list = list(rows)
+        if len(rows_list) == 0:
+            return
+        dict_ = {key: rows_list[0][key] for key in group_key}
         for key in self.columns:
-            dict_[key] = sum_score[key]
+            dict_[key] = sum(map(itemgetter(key), rows_list))
         yield dict_
 
 
+_SINGLE_PASS_REDUCERS = (TopN, TermFrequency, Count, Sum, MultiSum)
+
+
 # Joiners
 
 
 class InnerJoiner(Joiner):
     """Join with inner strategy"""
     def __call__(self, keys: tp.Sequence[str], rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
-        new_rows_b = list(rows_b)
-        for row_a in rows_a:
-            for row_b in new_rows_b:
-                join_dict: tp.Dict[str, tp.Any] = {}
-                intersection = set(row_a.keys()).intersection(set(row_b.keys()))
-                for key in set(row_a.keys()).difference(intersection):
-                    join_dict[key] = row_a[key]
-                for key in set(row_b.keys()).difference(intersection):
-                    join_dict[key] = row_b[key]
-                for key in keys:
-                    join_dict[key] = row_a[key]
-                for key in intersection.difference(set(keys)):
-                    join_dict[key + self._a_suffix] = row_a[key]
-                    join_dict[key + self._b_suffix] = row_b[key]
-                yield join_dict
+        iter_b = iter(rows_b)
+        first_b = next(iter_b, None)
+        if first_b is None:
+            return
+        iter_a = iter(rows_a)
+        first_a = next(iter_a, None)
+        if first_a is None:
+            return
+        second_b = next(iter_b, None)
+        # single row on the right side is the common primary key - foreign key case
+        new_rows_b: tp.Sequence[TRow] = (first_b,) if second_b is None else [first_b, second_b, *iter_b]
+
+        # rows of one group usually share columns, so split them into joined/suffixed ones once
+        # and fall back to splitting them for each pair only where columns differ
+        columns_a = first_a.keys()
+        columns_b = first_b.keys()
+        same_columns_b = all(row_b.keys() == columns_b for row_b in new_rows_b)
+        intersection = columns_a & columns_b
+        a_only = [key for key in first_a if key not in intersection]
+        b_only = [key for key in first_b if key not in intersection]
+        suffixed = [(key, key + self._a_suffix, key + self._b_suffix) for key in intersection if key not in keys]
+
+        for row_a in chain([first_a], iter_a):
+            if not same_columns_b or row_a.keys() != columns_a:
+                for row_b in new_rows_b:
+                    yield self._join_rows(keys, row_a, row_b)
+            elif len(suffixed) == 0:
+                # only join keys are shared and their values are equal, so rows can be merged as they are
+                for row_b in new_rows_b:
+                    yield {**row_a, **row_b}
+            else:
+                for row_b in new_rows_b:
+                    join_dict: tp.Dict[str, tp.Any] = {key: row_a[key] for key in a_only}
+                    for key in b_only:
+                        join_dict[key] = row_b[key]
+                    for key in keys:
+                        join_dict[key] = row_a[key]
+                    for key, key_a, key_b in suffixed:
+                        join_dict[key_a] = row_a[key]
+                        join_dict[key_b] = row_b[key]
+                    yield join_dict
+
+    def _join_rows(self, keys: tp.Sequence[str], row_a: TRow, row_b: TRow) -> TRow:
+        intersection = row_a.keys() & row_b.keys()
+        join_dict: tp.Dict[str, tp.Any] = {key: row_a[key] for key in row_a if key not in intersection}
+        for key in row_b:
+            if key not in intersection:
+                join_dict[key] = row_b[key]
+        for key in keys:
+            join_dict[key] = row_a[key]
+        for key in intersection.difference(keys):
+            join_dict[key + self._a_suffix] = row_a[key]
+            join_dict[key + self._b_suffix] = row_b[key]
+        return join_dict
 
 
 class OuterJoiner(Joiner):
@@ -491,16 +720,13 @@ class OuterJoiner(Joiner):
 class LeftJoiner(Joiner):
     """Join with left strategy"""
     def __call__(self, keys: tp.Sequence[str], rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
-        new_rows_a = list(rows_a)
         new_rows_b = list(rows_b)
-        join_dict: tp.Dict[str, tp.Any] = {}
-        for row_a in new_rows_a:
-            if len(new_rows_b) == 0:
-                yield row_a
+        if len(new_rows_b) == 0:
+            yield from rows_a
+            return
+        for row_a in rows_a:
             for row_b in new_rows_b:
-                join_dict = row_a.copy()
-                join_dict.update(row_b)
-                yield join_dict
+                yield {**row_a, **row_b}
 
 
 class RightJoiner(Joiner):
@@ -0,0 +1,99 @@
+from ..lib import Graph, operations as ops
+import multiprocessing
+import os
+import time
+import pytest
+
+
+def generate_rows() -> ops.TRowsGenerator:
+    for i in range(3000):
+        yield {'key': i // 3, 'value': i}
+
+
+def test_parallel_join() -> None:
+    left = [{'key': i, 'name': str(i)} for i in range(1000)]
+    right = Graph.graph_from_iter('right').reduce(ops.Count('count'), ['key'])
+    expected = Graph.graph_from_iter('left') \
+        .join(ops.InnerJoiner(), right, ['key']) \
+        .run(left=lambda: iter(left), right=generate_rows)
+    answer = Graph.graph_from_iter('left') \
+        .join(ops.InnerJoiner(), right, ['key'], parallel=True) \
+        .run(left=lambda: iter(left), right=generate_rows)
+    assert answer == expected
+    assert len(answer) == 1000
+
+
+def test_nested_parallel_join() -> None:
+    left = [{'key': i, 'name': str(i)} for i in range(1000)]
+    inner = Graph.graph_from_iter('inner') \
+        .join(ops.InnerJoiner(), Graph.graph_from_iter('right'), ['key'], parallel=True) \
+        .reduce(ops.Count('count'), ['key'], workers=2)
+    answer = Graph.graph_from_iter('left') \
+        .join(ops.InnerJoiner(), inner, ['key'], parallel=True) \
+        .run(left=lambda: iter(left), inner=lambda: iter(left), right=generate_rows)
+    assert answer == [{'key': i, 'name': str(i), 'count': 3} for i in range(1000)]
+
+
+def test_nested_parallel_join_closed_early() -> None:
+    pids = multiprocessing.get_context('fork').SimpleQueue()
+
+    def endless_rows() -> ops.TRowsGenerator:
+        pids.put(os.getpid())
+        key = 0
+        while True:
+            yield {'key': key}
+            key += 1
+
+    inner = Graph.graph_from_iter('inner') \
+        .join(ops.InnerJoiner(), Graph.graph_from_iter('right'), ['key'], parallel=True)
+    rows = Graph.graph_from_iter('left') \
+        .join(ops.InnerJoiner(), inner, ['key'], parallel=True) \
+        .gen_run(left=endless_rows, inner=endless_rows, right=endless_rows)
+    assert next(rows) == {'key': 0}
+    rows.close()
+    assert not multiprocessing.active_children()
+    branch_pids = {pids.get() for _ in range(3)} - {os.getpid()}
+    assert len(branch_pids) == 2
+    deadline = time.monotonic() + 10
+    while branch_pids and time.monotonic() < deadline:
+        for pid in list(branch_pids):
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                branch_pids.remove(pid)
+        time.sleep(0.1)
+    assert not branch_pids
+
+
+def test_parallel_join_error() -> None:
+    def broken_rows() -> ops.TRowsGenerator:
+        yield {'key': 0}
+        raise ValueError('broken source')
+
+    graph = Graph.graph_from_iter('left') \
+        .join(ops.InnerJoiner(), Graph.graph_from_iter('right'), ['key'], parallel=True)
+    with pytest.raises(ValueError, match='broken source'):
+        graph.run(left=lambda: iter([{'key': 0}]), right=broken_rows)
+
+
+def test_parallel_join_dead_process() -> None:
+    def killed_rows() -> ops.TRowsGenerator:
+        yield {'key': 0}
+        os._exit(1)
+
+    graph = Graph.graph_from_iter('left') \
+        .join(ops.InnerJoiner(), Graph.graph_from_iter('right'), ['key'], parallel=True)
+    with pytest.raises(RuntimeError, match='exited with code 1'):
+        graph.run(left=lambda: iter([{'key': 0}]), right=killed_rows)
+
+
+def test_merge_sorted_graphs() -> None:
+    first = [{'word': word} for word in ['a', 'b', 'b', 'd']]
+    second = [{'word': word} for word in ['b', 'c']]
+    third = [{'word': word} for word in ['a', 'd', 'e']]
+    graph = Graph.graph_from_iter('first') \
+        .merge([Graph.graph_from_iter('second'), Graph.graph_from_iter('third')], ['word']) \
+        .reduce(ops.Count('count'), ['word'])
+    answer = graph.run(first=lambda: iter(first), second=lambda: iter(second), third=lambda: iter(third))
+    assert answer == [{'word': 'a', 'count': 2}, {'word': 'b', 'count': 3}, {'word': 'c', 'count': 1},
+                      {'word': 'd', 'count': 2}, {'word': 'e', 'count': 1}]
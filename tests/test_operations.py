@@ -0,0 +1,158 @@
+from ..lib import operations as ops
+import pytest
+import typing as tp
+
+
+class BatchSizes(ops.BatchMapper):
+    batch_size = 3
+
+    def __init__(self) -> None:
+        self.sizes: tp.List[int] = []
+
+    def __call__(self, row: ops.TRow) -> ops.TRowsGenerator:
+        yield row
+
+    def process_batch(self, rows: tp.List[ops.TRow]) -> ops.TRowsGenerator:
+        self.sizes.append(len(rows))
+        yield from rows
+
+
+def test_batch_mapper() -> None:
+    mapper = BatchSizes()
+    rows = [{'x': i} for i in range(10)]
+    assert list(ops.Map(mapper)(iter(rows))) == rows
+    assert mapper.sizes == [3, 3, 3, 1]
+
+
+def test_haversine_batch() -> None:
+    rows = [{'start': [37.84870228730142, 55.73853974696249], 'end': [37.8490418381989, 55.73832445777953]},
+            {'start': [37.524768467992544, 55.88785375468433], 'end': [37.52415172755718, 55.88807155843824]},
+            {'start': [37.56963176652789, 55.846845586784184], 'end': [37.57018438540399, 55.8469259692356]}]
+    mapper = ops.HaversineMapper('start', 'end', 'length')
+    per_row = [out['length'] for row in rows for out in mapper(dict(row))]
+    batched = [out['length'] for out in mapper.process_batch([dict(row) for row in rows])]
+    assert batched == pytest.approx(per_row)
+    assert per_row == pytest.approx([0.032024, 0.045464, 0.035648], abs=1e-6)
+
+    # extra components of points, e.g. altitude, are ignored
+    rows = [{'start': [37.8, 55.7, 100.0], 'end': [37.9, 55.8, 0.0]},
+            {'start': [37.8, 55.7, 100.0], 'end': [37.9, 55.8, 0.0]}]
+    per_row = [out['length'] for row in rows for out in mapper(dict(row))]
+    batched = [out['length'] for out in mapper.process_batch([dict(row) for row in rows])]
+    assert batched == pytest.approx(per_row)
+
+
+def test_time_process_batch() -> None:
+    rows = [{'enter': '20171020T112238.723000', 'leave': '20171020T112244.468000'},
+            {'enter': '20171011T145553', 'leave': '20171011T145558'},
+            {'enter': '20171022T235959.500000', 'leave': '20171023T000001'},
+            {'enter': '19650303T061530', 'leave': '19650304T180000.250000'}]
+    mapper = ops.TimeProcessMapper('enter', 'leave', 'duration', 'hour', 'weekday')
+    per_row = [out for row in rows for out in mapper(dict(row))]
+    batched = list(mapper.process_batch([dict(row) for row in rows]))
+    assert [(row['weekday'], row['hour']) for row in batched] == [(row['weekday'], row['hour']) for row in per_row]
+    assert [row['duration'] for row in batched] == pytest.approx([row['duration'] for row in per_row])
+    assert [(row['weekday'], row['hour']) for row in per_row] == [('Fri', 11), ('Wed', 14), ('Sun', 23), ('Wed', 6)]
+
+
+def test_tokenize_mapper() -> None:
+    rows = [{'doc_id': 1, 'text': 'Hello, World! hello...'},
+            {'doc_id': 2, 'text': "Don't PANIC:\tit's 42 o'clock, Ünïcode"},
+            {'doc_id': 3, 'text': ''}]
+    filtered = ops.Map(ops.FilterPunctuation('text'))([dict(row) for row in rows])
+    expected = list(ops.Map(ops.Split('text'))(ops.Map(ops.LowerCase('text'))(filtered)))
+    tokenized = list(ops.Map(ops.TokenizeMapper('text'))([dict(row) for row in rows]))
+    assert tokenized == expected
+    assert [row['text'] for row in tokenized] == ['hello', 'world', 'hello', 'dont', 'panicits', 'oclock', 'ünïcode']
+    assert [row['doc_id'] for row in tokenized] == [1, 1, 1, 2, 2, 2, 2]
+
+
+def normalized(rows: ops.TRowsIterable) -> tp.List[tp.List[tp.Tuple[str, tp.Any]]]:
+    return sorted(sorted(row.items()) for row in rows)
+
+
+@pytest.mark.parametrize('rows_a, rows_b, expected', [
+    ([{'k': 1, 'x': 1}, {'k': 1}], [{'k': 1, 'x': 2}],
+     [{'k': 1, 'x_1': 1, 'x_2': 2}, {'k': 1, 'x': 2}]),
+    ([{'k': 1, 'y': 1}, {'k': 1, 'x': 1}], [{'k': 1, 'x': 2}],
+     [{'k': 1, 'y': 1, 'x': 2}, {'k': 1, 'x_1': 1, 'x_2': 2}]),
+    ([{'k': 1, 'x': 1}], [{'k': 1}, {'k': 1, 'x': 2}],
+     [{'k': 1, 'x': 1}, {'k': 1, 'x_1': 1, 'x_2': 2}]),
+])
+def test_inner_joiner_rows_with_different_columns(
+        rows_a: tp.List[ops.TRow], rows_b: tp.List[ops.TRow], expected: tp.List[ops.TRow]) -> None:
+    assert list(ops.InnerJoiner()(['k'], rows_a, rows_b)) == expected
+
+
+@pytest.mark.parametrize('joiner', [ops.InnerJoiner, ops.OuterJoiner, ops.LeftJoiner, ops.RightJoiner])
+def test_hash_join_as_merge_join(joiner: tp.Type[ops.Joiner]) -> None:
+    left = [{'key': key, 'id': i, 'name': 'a'} for i, key in enumerate([3, 0, 1, 1, 5, 3, 3, 7])]
+    right = [{'key': key, 'score': i, 'name': 'b'} for i, key in enumerate([1, 2, 3, 3, 6, 0, 9])]
+
+    def sort_key(row: ops.TRow) -> int:
+        return row['key']
+
+    merge = ops.Join(joiner(), ['key'])(sorted(left, key=sort_key), sorted(right, key=sort_key))
+    hashed = ops.Join(joiner(), ['key'], strategy='hash')(iter(left), iter(right))
+    assert normalized(hashed) == normalized(merge)
+
+    for rows_a, rows_b in [([], right), (left, []), ([], [])]:
+        merge = ops.Join(joiner(), ['key'])(sorted(rows_a, key=sort_key), sorted(rows_b, key=sort_key))
+        hashed = ops.Join(joiner(), ['key'], strategy='hash')(iter(rows_a), iter(rows_b))
+        assert normalized(hashed) == normalized(merge)
+
+
+def test_hash_join_unhashable_key() -> None:
+    rows = [{'start': [37.5, 55.7], 'value': 1}]
+    with pytest.raises(TypeError, match='hashable'):
+        list(ops.Join(ops.InnerJoiner(), ['start'], strategy='hash')(iter(rows), iter(rows)))
+
+
+def test_hash_join_upstream_type_error() -> None:
+    def broken_rows() -> ops.TRowsGenerator:
+        yield {'key': 1}
+        raise TypeError('broken source')
+
+    with pytest.raises(TypeError, match='^broken source$'):
+        list(ops.Join(ops.InnerJoiner(), ['key'], strategy='hash')(iter([{'key': 1}]), broken_rows()))
+
+
+def test_unknown_join_strategy() -> None:
+    with pytest.raises(ValueError):
+        ops.Join(ops.InnerJoiner(), ['key'], strategy='nested')
+
+
+class Share(ops.Reducer):
+    """Reads group twice: once for total and once for shares"""
+    def __call__(self, group_key: tp.Sequence[str], rows: ops.TRowsIterable) -> ops.TRowsGenerator:
+        total = sum(row['value'] for row in rows)
+        for row in rows:
+            yield {'key': row['key'], 'share': row['value'] / total}
+
+
+@pytest.mark.parametrize('reducer', [ops.Sum('value'), ops.Count('count'), ops.TopN('value', 2), Share()])
+def test_reduce_with_workers(reducer: ops.Reducer) -> None:
+    rows = [{'key': i // 7, 'value': i % 5 + 1} for i in range(5000)]
+    expected = list(ops.Reduce(reducer, ['key'])(iter(rows)))
+    assert list(ops.Reduce(reducer, ['key'], workers=2, chunksize=16)(iter(rows))) == expected
+    assert len(expected) > 0
+
+
+def test_reduce_with_workers_reads_ahead_boundedly() -> None:
+    pulled = 0
+
+    def generate_rows() -> ops.TRowsGenerator:
+        nonlocal pulled
+        for i in range(100000):
+            pulled += 1
+            yield {'key': i // 2, 'value': i}
+
+    result = ops.Reduce(ops.Sum('value'), ['key'], workers=2, chunksize=16)(generate_rows())
+    assert next(result) == {'key': 0, 'value': 1}
+    assert pulled < 1000
+    result.close()
+
+
+def test_reduce_reducer_reading_group_twice() -> None:
+    rows = [{'key': 0, 'value': 1}, {'key': 0, 'value': 3}]
+    assert list(ops.Reduce(Share(), ['key'])(iter(rows))) == [{'key': 0, 'share': 0.25}, {'key': 0, 'share': 0.75}]